@@ -6,4 +6,4 @@ bp = Blueprint("inner_api", __name__, url_prefix="/inner/api")
 api = ExternalApi(bp)
 
 from .plugin import plugin
-from .workspace import workspace
+from .workspace import email, workspace
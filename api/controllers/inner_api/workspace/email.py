@@ -0,0 +1,301 @@
+import base64
+import binascii
+import json
+import logging
+import uuid
+from datetime import datetime
+
+from flask import Response, stream_with_context
+from flask_restful import Resource, fields, marshal, reqparse  # type: ignore
+from sqlalchemy import event, func, select, tuple_
+from sqlalchemy.orm import load_only, raiseload
+from werkzeug.exceptions import NotFound
+
+from controllers.console.wraps import setup_required
+from controllers.inner_api import api
+from controllers.inner_api.wraps import enterprise_inner_api_only
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from fields.dataset_fields import dataset_fields
+from libs.helper import TimestampField, email
+from models.account import Account, TenantAccountJoin
+from models.dataset import Dataset, DatasetPermission, DatasetPermissionEnum
+from models.model import App, InstalledApp
+
+logger = logging.getLogger(__name__)
+
+app_fields = {
+    "id": fields.String,
+    "name": fields.String,
+    "description": fields.String,
+    "mode": fields.String,
+    "icon_type": fields.String,
+    "icon": fields.String,
+    "icon_background": fields.String,
+    "status": fields.String,
+    "enable_site": fields.Boolean,
+    "enable_api": fields.Boolean,
+    "created_by": fields.String,
+    "created_at": TimestampField,
+}
+
+
+def _encode_cursor(created_at: datetime, resource_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.timestamp()},{resource_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        timestamp, _, resource_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition(",")
+        # reject non-UUID ids here so they 400 like any other malformed cursor
+        # instead of blowing up in Postgres as a uuid cast error
+        uuid.UUID(resource_id)
+        return datetime.fromtimestamp(float(timestamp)), resource_id
+    except (binascii.Error, UnicodeDecodeError, ValueError, OverflowError, OSError):
+        # OSError: fromtimestamp rejects out-of-range but finite timestamps
+        # (e.g. -9e18) with EINVAL rather than OverflowError
+        raise ValueError("Invalid cursor.")
+
+
+def _paginate(query, limit: int, offset: int, cursor: str | None, model):
+    """Paginate an ordered query, preferring keyset (seek) pagination over OFFSET.
+
+    With a cursor the filter `(created_at, id) < (cursor_ts, cursor_id)` walks the
+    `(tenant_id, created_at, id)` index directly, so page depth no longer matters.
+    Without a cursor the legacy OFFSET path (and its total count) is kept for the
+    first page and for old clients.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+
+    total = None
+    if cursor:
+        cursor_ts, cursor_id = _decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < (cursor_ts, cursor_id))
+        rows = query.limit(limit + 1).all()
+    else:
+        # compute the total as a window aggregate of the same select instead of a
+        # separate COUNT(*) query, which would re-scan the whole filtered set
+        rows = query.add_columns(func.count().over().label("total")).offset(offset).limit(limit + 1).all()
+        total = rows[0].total if rows else 0
+        rows = [row[0] for row in rows]
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+
+    return rows, total, has_more, next_cursor
+
+
+def _stream_page(rows, row_fields, limit: int, total, has_more: bool, next_cursor) -> Response:
+    """Stream the page as JSON, marshalling one row at a time.
+
+    Marshalling the whole page up front holds every serialized dict in memory
+    on top of the ORM rows before Flask even starts writing; emitting per-row
+    chunks keeps the serialization overhead at a single row.
+    """
+
+    def generate():
+        yield '{"data": ['
+        for index, row in enumerate(rows):
+            prefix = "" if index == 0 else ", "
+            yield prefix + json.dumps(marshal(row, row_fields))
+        tail = {"limit": limit, "has_more": has_more, "next_cursor": next_cursor}
+        if total is not None:
+            tail["total"] = total
+        # splice the tail keys into the envelope object
+        yield "], " + json.dumps(tail)[1:]
+
+    return Response(stream_with_context(generate()), content_type="application/json")
+
+
+_MAX_PAGE_SIZE = 100
+
+
+def _list_args():
+    parser = reqparse.RequestParser()
+    parser.add_argument("email", type=email, required=True, location="args")
+    parser.add_argument("limit", type=int, default=20, location="args")
+    parser.add_argument("offset", type=int, default=0, location="args")
+    parser.add_argument("cursor", type=str, default=None, location="args")
+    args = parser.parse_args()
+    # cap the page size server-side (same ceiling as the console listings use
+    # via paginate(max_per_page=100)) so a crafted ?limit= cannot force the
+    # ORM and marshaller to materialize an unbounded number of rows
+    args["limit"] = min(max(args["limit"], 1), _MAX_PAGE_SIZE)
+    args["offset"] = max(args["offset"], 0)
+    return args
+
+
+_ACCOUNT_TENANT_CACHE_KEY = "acct_tenant:{email}"
+_ACCOUNT_TENANT_CACHE_TTL = 300
+
+
+def _resolve_account_tenant(email_address: str) -> tuple[str | None, str | None]:
+    """Resolve an email to (account_id, tenant_id), caching the pair in Redis.
+
+    Both listing endpoints repeat the same account and tenant-join lookups before
+    doing any real work; caching the resolved pair collapses them into a single
+    Redis hit. Workspace switches invalidate the key via the TenantAccountJoin
+    events below, so the TTL only bounds staleness of deleted accounts.
+    """
+    cache_key = _ACCOUNT_TENANT_CACHE_KEY.format(email=email_address)
+    cached = redis_client.get(cache_key)
+    if cached:
+        account_id, tenant_id = json.loads(cached)
+        return account_id, tenant_id
+
+    # one joined select resolves both ids in a single roundtrip: the covering
+    # email index feeds the account side, and ORDER BY current DESC picks the
+    # current workspace when one is flagged, any membership otherwise; the
+    # outer join keeps "account without workspace" distinguishable from
+    # "unknown email"
+    row = db.session.execute(
+        select(Account.id, TenantAccountJoin.tenant_id)
+        .outerjoin(TenantAccountJoin, TenantAccountJoin.account_id == Account.id)
+        .where(Account.email == email_address)
+        .order_by(TenantAccountJoin.current.desc(), TenantAccountJoin.created_at.asc())
+        .limit(1)
+    ).first()
+    if not row:
+        return None, None
+
+    account_id, tenant_id = row
+    if not tenant_id:
+        return account_id, None
+
+    redis_client.setex(cache_key, _ACCOUNT_TENANT_CACHE_TTL, json.dumps([account_id, tenant_id]))
+    return account_id, tenant_id
+
+
+@event.listens_for(TenantAccountJoin, "after_insert")
+@event.listens_for(TenantAccountJoin, "after_update")
+@event.listens_for(TenantAccountJoin, "after_delete")
+def _invalidate_account_tenant_cache(mapper, connection, target):
+    email_address = connection.execute(select(Account.email).where(Account.id == target.account_id)).scalar()
+    if email_address:
+        redis_client.delete(_ACCOUNT_TENANT_CACHE_KEY.format(email=email_address))
+
+
+class EmailDatasetsApi(Resource):
+    """List the datasets visible to the account with the given email in its current workspace."""
+
+    @setup_required
+    @enterprise_inner_api_only
+    def get(self):
+        args = _list_args()
+
+        account_id, tenant_id = _resolve_account_tenant(args["email"])
+        if not account_id:
+            raise NotFound("Account not found.")
+        if not tenant_id:
+            raise NotFound("Workspace not found.")
+
+        permission_filters = [
+            Dataset.permission == DatasetPermissionEnum.ALL_TEAM,
+            db.and_(Dataset.permission == DatasetPermissionEnum.ONLY_ME, Dataset.created_by == account_id),
+        ]
+
+        # most accounts have no per-user grants at all; a LIMIT 1 probe of the
+        # account_id index decides whether the partial-team arm is needed, so
+        # the common case hands the planner a two-arm predicate
+        has_any_permission_rows = db.session.execute(
+            select(DatasetPermission.id).where(DatasetPermission.account_id == account_id).limit(1)
+        ).first()
+        if has_any_permission_rows:
+            # correlated EXISTS instead of IN (subquery): the planner probes the
+            # partial (account_id, dataset_id) index per candidate row rather
+            # than materializing the whole permission set
+            has_dataset_permission = (
+                db.session.query(DatasetPermission)
+                .filter(
+                    DatasetPermission.dataset_id == Dataset.id,
+                    DatasetPermission.account_id == account_id,
+                    DatasetPermission.has_permission.is_(True),
+                )
+                .exists()
+            )
+            permission_filters.append(
+                db.and_(Dataset.permission == DatasetPermissionEnum.PARTIAL_TEAM, has_dataset_permission)
+            )
+
+        # fetch only the columns dataset_fields actually marshals instead of
+        # every mapped column (index_struct and retrieval_model can be large)
+        query = db.session.query(Dataset).options(
+            load_only(
+                Dataset.id,
+                Dataset.name,
+                Dataset.description,
+                Dataset.permission,
+                Dataset.data_source_type,
+                Dataset.indexing_technique,
+                Dataset.created_by,
+                Dataset.created_at,
+            )
+        )
+
+        query = query.filter(Dataset.tenant_id == tenant_id, db.or_(*permission_filters))
+
+        datasets, total, has_more, next_cursor = _paginate(
+            query, args["limit"], args["offset"], args["cursor"], Dataset
+        )
+
+        logger.info("Found %d datasets for account %s", len(datasets), args["email"])
+
+        return _stream_page(datasets, dataset_fields, args["limit"], total, has_more, next_cursor)
+
+
+class EmailAppsApi(Resource):
+    """List the installed apps of the current workspace of the account with the given email."""
+
+    @setup_required
+    @enterprise_inner_api_only
+    def get(self):
+        args = _list_args()
+
+        account_id, tenant_id = _resolve_account_tenant(args["email"])
+        if not account_id:
+            raise NotFound("Account not found.")
+        if not tenant_id:
+            raise NotFound("Workspace not found.")
+
+        # keep the installed-app ids in SQL as a semi-join instead of
+        # materializing them into a Python list and binding one parameter per id
+        installed_app_ids = select(InstalledApp.app_id).where(InstalledApp.tenant_id == tenant_id).scalar_subquery()
+
+        # fetch only the columns app_fields marshals; raiseload guards against
+        # any lazy load sneaking into the marshaller as a per-row query
+        query = (
+            db.session.query(App)
+            .options(
+                load_only(
+                    App.id,
+                    App.name,
+                    App.description,
+                    App.mode,
+                    App.icon_type,
+                    App.icon,
+                    App.icon_background,
+                    App.status,
+                    App.enable_site,
+                    App.enable_api,
+                    App.created_by,
+                    App.created_at,
+                ),
+                raiseload("*"),
+            )
+            .filter(
+                App.tenant_id == tenant_id,
+                App.id.in_(installed_app_ids),
+                App.is_universal.is_(False),
+            )
+        )
+
+        apps, total, has_more, next_cursor = _paginate(query, args["limit"], args["offset"], args["cursor"], App)
+
+        logger.info("Found %d apps for account %s", len(apps), args["email"])
+
+        return _stream_page(apps, app_fields, args["limit"], total, has_more, next_cursor)
+
+
+api.add_resource(EmailDatasetsApi, "/enterprise/email/datasets")
+api.add_resource(EmailAppsApi, "/enterprise/email/apps")
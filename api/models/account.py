@@ -21,7 +21,10 @@ class AccountStatus(enum.StrEnum):
 
 class Account(UserMixin, Base):
     __tablename__ = "accounts"
-    __table_args__ = (db.PrimaryKeyConstraint("id", name="account_pkey"), db.Index("account_email_idx", "email"))
+    __table_args__ = (
+        db.PrimaryKeyConstraint("id", name="account_pkey"),
+        db.Index("account_email_id_idx", "email", unique=True, postgresql_include=["id"]),
+    )
 
     id: Mapped[str] = mapped_column(StringUUID, server_default=db.text("uuid_generate_v4()"))
     name = db.Column(db.String(255), nullable=False)
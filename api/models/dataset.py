@@ -38,6 +38,7 @@ class Dataset(db.Model):  # type: ignore[name-defined]
     __table_args__ = (
         db.PrimaryKeyConstraint("id", name="dataset_pkey"),
         db.Index("dataset_tenant_idx", "tenant_id"),
+        db.Index("dataset_tenant_created_at_id_idx", "tenant_id", "created_at", "id"),
         db.Index("retrieval_model_idx", "retrieval_model", postgresql_using="gin"),
     )
 
@@ -985,6 +986,12 @@ class DatasetPermission(db.Model):  # type: ignore[name-defined]
         db.PrimaryKeyConstraint("id", name="dataset_permission_pkey"),
         db.Index("idx_dataset_permissions_dataset_id", "dataset_id"),
         db.Index("idx_dataset_permissions_account_id", "account_id"),
+        db.Index(
+            "idx_dataset_permissions_account_dataset_has",
+            "account_id",
+            "dataset_id",
+            postgresql_where=db.text("has_permission"),
+        ),
         db.Index("idx_dataset_permissions_tenant_id", "tenant_id"),
     )
 
@@ -76,7 +76,11 @@ class IconType(Enum):
 
 class App(Base):
     __tablename__ = "apps"
-    __table_args__ = (db.PrimaryKeyConstraint("id", name="app_pkey"), db.Index("app_tenant_id_idx", "tenant_id"))
+    __table_args__ = (
+        db.PrimaryKeyConstraint("id", name="app_pkey"),
+        db.Index("app_tenant_id_idx", "tenant_id"),
+        db.Index("app_tenant_created_at_id_idx", "tenant_id", "created_at", "id"),
+    )
 
     id = db.Column(StringUUID, server_default=db.text("uuid_generate_v4()"))
     tenant_id: Mapped[str] = db.Column(StringUUID, nullable=False)
@@ -0,0 +1,39 @@
+import base64
+import uuid
+from datetime import datetime
+
+import pytest
+
+from controllers.inner_api.workspace.email import _decode_cursor, _encode_cursor
+
+
+def _raw_cursor(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def test_cursor_roundtrip():
+    created_at = datetime(2025, 8, 31, 12, 30, 45, 500000)
+    resource_id = str(uuid.uuid4())
+
+    decoded_ts, decoded_id = _decode_cursor(_encode_cursor(created_at, resource_id))
+
+    assert decoded_ts == created_at
+    assert decoded_id == resource_id
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not base64!",
+        _raw_cursor("123.0"),  # no id half
+        _raw_cursor("123.0,notauuid"),
+        _raw_cursor(f"notafloat,{uuid.uuid4()}"),
+        _raw_cursor(f"1e400,{uuid.uuid4()}"),  # overflows to inf
+        _raw_cursor(f"-9e18,{uuid.uuid4()}"),  # finite but EINVAL in fromtimestamp
+        _raw_cursor(f"9e18,{uuid.uuid4()}"),
+    ],
+)
+def test_decode_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor."):
+        _decode_cursor(cursor)